@@ -1,18 +1,62 @@
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for, flash
+from flask import Flask, render_template, request, jsonify, session, redirect, url_for, flash, has_request_context
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy import DDL, event, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime, timedelta
 import json
 import os
 import re
 from functools import wraps
+import click
+import recommendations
+
+def database_url(name, default=None):
+    """Read a database URL from the environment, pinning PostgreSQL URLs to psycopg2"""
+    url = os.environ.get(name, default)
+    # Legacy postgres:// URLs and bare postgresql:// URLs (whose default driver
+    # depends on the SQLAlchemy version) both use the driver in requirements.txt
+    for scheme in ('postgres://', 'postgresql://'):
+        if url and url.startswith(scheme):
+            url = 'postgresql+psycopg2://' + url[len(scheme):]
+    return url
 
 app = Flask(__name__)
-app.config['SECRET_KEY'] = 'your-secret-key-here'
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///internship_platform.db'
+app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'your-secret-key-here')
+app.config['SQLALCHEMY_DATABASE_URI'] = database_url('DATABASE_URL', 'sqlite:///internship_platform.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
-db = SQLAlchemy(app)
+# Optional read replica; read-only routes are served from it when configured
+REPLICA_BIND = 'replica'
+if database_url('DATABASE_REPLICA_URL'):
+    app.config['SQLALCHEMY_BINDS'] = {REPLICA_BIND: database_url('DATABASE_REPLICA_URL')}
+
+# Endpoints that never write and may be served from the replica
+READ_ONLY_ENDPOINTS = {'index', 'internships', 'internship_detail'}
+
+# Per-user tables are always read from the primary so users see their own writes
+PRIMARY_ONLY_TABLES = {'user', 'application', 'user_recommendation'}
+
+def is_read_only_endpoint(endpoint):
+    return endpoint is not None and (endpoint in READ_ONLY_ENDPOINTS or endpoint.startswith('api_'))
+
+class RoutingSession(Session):
+    """Session that sends read-only routes to the replica and everything else to the primary"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and not self._flushing and has_request_context()
+                and is_read_only_endpoint(request.endpoint)
+                and not (mapper is not None and db.inspect(mapper).local_table.name in PRIMARY_ONLY_TABLES)):
+            engines = self._db.engines
+            if REPLICA_BIND in engines:
+                return engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+db = SQLAlchemy(app, session_options={'class_': RoutingSession})
+
+def is_postgresql():
+    return db.engine.dialect.name == 'postgresql'
 
 # Database Models
 class User(db.Model):
@@ -30,6 +74,7 @@ class User(db.Model):
     resume_url = db.Column(db.String(500), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     is_verified = db.Column(db.Boolean, default=False)
+    recommendations_computed_at = db.Column(db.DateTime, nullable=True)  # None until scored
 
 class Internship(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -48,6 +93,55 @@ class Internship(db.Model):
     skills_required = db.Column(db.Text, nullable=True)
     is_verified = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('title', 'company', name='uq_internship_title_company'),
+    )
+
+# Full-text search document for PostgreSQL; other backends fall back to LIKE matching
+INTERNSHIP_SEARCH_DOCUMENT = "coalesce(title, '') || ' ' || coalesce(company, '') || ' ' || coalesce(description, '')"
+
+event.listen(
+    Internship.__table__,
+    'after_create',
+    DDL(
+        "CREATE INDEX IF NOT EXISTS ix_internship_search ON internship "
+        f"USING gin (to_tsvector('simple', {INTERNSHIP_SEARCH_DOCUMENT}))"
+    ).execute_if(dialect='postgresql')
+)
+
+class InternshipChange(db.Model):
+    """Append-only change log backing the /api/internships/changes feed"""
+    id = db.Column(db.Integer, primary_key=True)  # doubles as the client sync cursor
+    internship_id = db.Column(db.Integer, nullable=False, index=True)  # no FK so tombstones outlive the row
+    change_type = db.Column(db.String(10), nullable=False)  # 'upsert', 'delete'
+    changed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+# Advisory lock key serialising change-log writers on PostgreSQL
+CHANGE_LOG_LOCK_KEY = 270270
+
+def log_internship_change(connection, internship_id, change_type):
+    # Cursors are only safe if ids become visible in id order. Sequence ids are
+    # handed out at insert time, so hold a transaction-scoped lock until commit;
+    # SQLite already serialises writers through its database lock.
+    if connection.dialect.name == 'postgresql':
+        connection.execute(db.text('SELECT pg_advisory_xact_lock(:key)'), {'key': CHANGE_LOG_LOCK_KEY})
+    connection.execute(InternshipChange.__table__.insert().values(
+        internship_id=internship_id,
+        change_type=change_type,
+        changed_at=datetime.utcnow()
+    ))
+
+@event.listens_for(Internship, 'after_insert')
+@event.listens_for(Internship, 'after_update')
+def record_internship_change(mapper, connection, target):
+    # Unverified postings are hidden from the API, so de-verification is a tombstone
+    log_internship_change(connection, target.id, 'upsert' if target.is_verified else 'delete')
+
+@event.listens_for(Internship, 'after_delete')
+def record_internship_delete(mapper, connection, target):
+    log_internship_change(connection, target.id, 'delete')
 
 class Application(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -57,6 +151,21 @@ class Application(db.Model):
     applied_at = db.Column(db.DateTime, default=datetime.utcnow)
     cover_letter = db.Column(db.Text, nullable=True)
 
+class UserRecommendation(db.Model):
+    """Precomputed top-N internships per user, written by the precompute-recommendations job"""
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    internship_id = db.Column(db.Integer, db.ForeignKey('internship.id', ondelete='CASCADE'), nullable=False)
+    rank = db.Column(db.Integer, nullable=False)
+    score = db.Column(db.Float, nullable=False)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'rank', name='uq_user_recommendation_user_rank'),
+    )
+
+RECOMMENDATION_COUNT = 6
+
 # Helper Functions
 def login_required(f):
     @wraps(f)
@@ -75,38 +184,190 @@ def load_sample_data():
     except FileNotFoundError:
         return []
 
+def internship_row(internship_data):
+    """Convert a sample data entry into Internship column values"""
+    return {
+        'title': internship_data['title'],
+        'company': internship_data['company'],
+        'company_type': internship_data['company_type'],
+        'description': internship_data['description'],
+        'requirements': internship_data['requirements'],
+        'duration': internship_data['duration'],
+        'stipend': internship_data.get('stipend', 'Unpaid'),
+        'location': internship_data['location'],
+        'start_date': datetime.strptime(internship_data['start_date'], '%Y-%m-%d').date(),
+        'end_date': datetime.strptime(internship_data['end_date'], '%Y-%m-%d').date(),
+        'application_deadline': datetime.strptime(internship_data['application_deadline'], '%Y-%m-%d').date(),
+        'category': internship_data['category'],
+        'skills_required': internship_data.get('skills_required', ''),
+        'is_verified': True
+    }
+
 def populate_database():
     """Populate database with sample internship data"""
-    sample_data = load_sample_data()
+    rows = [internship_row(internship_data) for internship_data in load_sample_data()]
+    if not rows:
+        return
     
-    for internship_data in sample_data:
-        # Check if internship already exists
-        existing = Internship.query.filter_by(
-            title=internship_data['title'],
-            company=internship_data['company']
-        ).first()
-        
-        if not existing:
-            internship = Internship(
-                title=internship_data['title'],
-                company=internship_data['company'],
-                company_type=internship_data['company_type'],
-                description=internship_data['description'],
-                requirements=internship_data['requirements'],
-                duration=internship_data['duration'],
-                stipend=internship_data.get('stipend', 'Unpaid'),
-                location=internship_data['location'],
-                start_date=datetime.strptime(internship_data['start_date'], '%Y-%m-%d').date(),
-                end_date=datetime.strptime(internship_data['end_date'], '%Y-%m-%d').date(),
-                application_deadline=datetime.strptime(internship_data['application_deadline'], '%Y-%m-%d').date(),
-                category=internship_data['category'],
-                skills_required=internship_data.get('skills_required', ''),
-                is_verified=True
-            )
-            db.session.add(internship)
+    if is_postgresql():
+        # Single round trip; existing (title, company) pairs are left untouched
+        statement = pg_insert(Internship.__table__).values(rows).on_conflict_do_nothing(
+            constraint='uq_internship_title_company'
+        ).returning(Internship.id)
+        # Core inserts skip the mapper events, so log the new rows here
+        connection = db.session.connection()
+        for internship_id in db.session.execute(statement).scalars().all():
+            log_internship_change(connection, internship_id, 'upsert')
+    else:
+        for row in rows:
+            # Check if internship already exists
+            existing = Internship.query.filter_by(
+                title=row['title'],
+                company=row['company']
+            ).first()
+            
+            if not existing:
+                db.session.add(Internship(**row))
     
     db.session.commit()
 
+def upgrade_schema():
+    """Bring databases created by earlier releases up to date"""
+    inspector = db.inspect(db.engine)
+    columns = [column['name'] for column in inspector.get_columns('internship')]
+    if 'updated_at' not in columns:
+        db.session.execute(db.text('ALTER TABLE internship ADD COLUMN updated_at TIMESTAMP'))
+        db.session.execute(db.text('UPDATE internship SET updated_at = created_at'))
+    
+    # populate_database targets this constraint on PostgreSQL; SQLite cannot add
+    # constraints in place and keeps its lookup-then-insert path instead
+    constraints = [constraint['name'] for constraint in inspector.get_unique_constraints('internship')]
+    if is_postgresql() and 'uq_internship_title_company' not in constraints:
+        db.session.execute(db.text(
+            'ALTER TABLE internship ADD CONSTRAINT uq_internship_title_company UNIQUE (title, company)'
+        ))
+    
+    columns = [column['name'] for column in inspector.get_columns('user')]
+    if 'recommendations_computed_at' not in columns:
+        db.session.execute(db.text('ALTER TABLE "user" ADD COLUMN recommendations_computed_at TIMESTAMP'))
+    
+    # Seed the change log so a sync from cursor 0 sees the existing catalogue
+    if InternshipChange.query.first() is None:
+        for internship in Internship.query.filter_by(is_verified=True).order_by(Internship.id).all():
+            db.session.add(InternshipChange(internship_id=internship.id, change_type='upsert'))
+    
+    db.session.commit()
+
+def serialize_internship(i):
+    """Public API representation of an internship"""
+    return {
+        'id': i.id,
+        'title': i.title,
+        'company': i.company,
+        'company_type': i.company_type,
+        'location': i.location,
+        'duration': i.duration,
+        'stipend': i.stipend,
+        'start_date': i.start_date.isoformat(),
+        'end_date': i.end_date.isoformat(),
+        'application_deadline': i.application_deadline.isoformat(),
+        'category': i.category,
+        'updated_at': i.updated_at.isoformat() if i.updated_at else None
+    }
+
+def latest_change_cursor():
+    return db.session.query(func.max(InternshipChange.id)).scalar() or 0
+
+def open_internships_filter():
+    """Internships that are verified and still accepting applications"""
+    return db.and_(
+        Internship.is_verified == True,
+        Internship.application_deadline >= datetime.now().date()
+    )
+
+# Feature matrix of open internships, rebuilt only when the catalogue changes
+_open_internship_matrix = {}
+
+def open_internship_matrix():
+    """Cached (ids, vocabulary, matrix) for open internships"""
+    # Any catalogue write moves the change-log cursor; deadlines expire by date
+    key = (latest_change_cursor(), datetime.now().date())
+    if _open_internship_matrix.get('key') != key:
+        internships = Internship.query.filter(open_internships_filter()).order_by(Internship.id).all()
+        _open_internship_matrix['matrix'] = recommendations.build_internship_matrix(internships)
+        _open_internship_matrix['key'] = key
+    return _open_internship_matrix['matrix']
+
+def lock_users(user_ids):
+    """Row-lock users until commit so their recommendations have a single writer"""
+    # Lock in id order so the batch job and dashboard visits cannot deadlock
+    db.session.execute(
+        db.select(User.id).where(User.id.in_(user_ids)).order_by(User.id).with_for_update()
+    )
+
+def store_recommendations(users, ranked, computed_at):
+    """Replace the stored recommendations of users and mark them as computed"""
+    user_ids = [user.id for user in users]
+    lock_users(user_ids)
+    rows = [{
+        'user_id': user.id,
+        'internship_id': internship_id,
+        'rank': rank,
+        'score': score,
+        'computed_at': computed_at
+    } for user, user_ranked in zip(users, ranked)
+      for rank, (internship_id, score) in enumerate(user_ranked)]
+    
+    db.session.execute(UserRecommendation.__table__.delete().where(
+        UserRecommendation.user_id.in_(user_ids)
+    ))
+    if rows:
+        db.session.execute(UserRecommendation.__table__.insert(), rows)
+    # An empty result is still a result; the marker stops it being rescored on every visit
+    db.session.execute(User.__table__.update().where(User.id.in_(user_ids)).values(
+        recommendations_computed_at=computed_at
+    ))
+
+def clear_recommendations(user):
+    """Drop a user's stored recommendations so they are rescored on the next visit"""
+    lock_users([user.id])
+    db.session.execute(UserRecommendation.__table__.delete().where(
+        UserRecommendation.user_id == user.id
+    ))
+    user.recommendations_computed_at = None
+
+def recommend_for_user(user):
+    """Recommended internships for a user, precomputed where available"""
+    if user.recommendations_computed_at is None:
+        # Not yet covered by the batch job; score once and store like the job would.
+        # Concurrent first visits queue on the row lock and re-read the marker.
+        lock_users([user.id])
+        db.session.refresh(user, ['recommendations_computed_at'])
+        if user.recommendations_computed_at is None:
+            ids, vocabulary, matrix = open_internship_matrix()
+            ranked = recommendations.score_users([user], ids, vocabulary, matrix, RECOMMENDATION_COUNT)
+            store_recommendations([user], ranked, datetime.utcnow())
+        db.session.commit()
+    
+    return Internship.query.join(
+        UserRecommendation, UserRecommendation.internship_id == Internship.id
+    ).filter(
+        UserRecommendation.user_id == user.id,
+        open_internships_filter()
+    ).order_by(UserRecommendation.rank).limit(RECOMMENDATION_COUNT).all()
+
+def search_filter(search):
+    """Build the search clause for the internships listing"""
+    if is_postgresql():
+        document = func.to_tsvector('simple', db.text(INTERNSHIP_SEARCH_DOCUMENT))
+        return document.op('@@')(func.plainto_tsquery('simple', search))
+    
+    return db.or_(
+        Internship.title.contains(search),
+        Internship.company.contains(search),
+        Internship.description.contains(search)
+    )
+
 # Routes
 @app.route('/')
 def index():
@@ -179,11 +440,8 @@ def dashboard():
     user = User.query.get(session['user_id'])
     recent_applications = Application.query.filter_by(user_id=user.id).order_by(Application.applied_at.desc()).limit(5).all()
     
-    # Get recommended internships based on user's field of study
-    recommended = Internship.query.filter(
-        Internship.category.contains(user.field_of_study),
-        Internship.is_verified == True
-    ).limit(6).all()
+    # Get recommended internships based on user's skills, field of study and education
+    recommended = recommend_for_user(user)
     
     return render_template('dashboard.html', user=user, applications=recent_applications, recommended=recommended)
 
@@ -204,13 +462,7 @@ def internships():
         query = query.filter(Internship.category.contains(category))
     
     if search:
-        query = query.filter(
-            db.or_(
-                Internship.title.contains(search),
-                Internship.company.contains(search),
-                Internship.description.contains(search)
-            )
-        )
+        query = query.filter(search_filter(search))
     
     internships = query.order_by(Internship.created_at.desc()).paginate(
         page=page, per_page=12, error_out=False
@@ -294,6 +546,8 @@ def update_profile():
     user.graduation_year = int(request.form['graduation_year'])
     user.skills = request.form.get('skills', '')
     
+    # Stored picks were scored against the old profile
+    clear_recommendations(user)
     db.session.commit()
     
     flash('Profile updated successfully!', 'success')
@@ -328,20 +582,53 @@ def logout():
 @app.route('/api/internships')
 def api_internships():
     """API endpoint for internships data"""
+    # Read the cursor first so changes committed during the query are replayed, not missed
+    cursor = latest_change_cursor()
     internships = Internship.query.filter_by(is_verified=True).all()
-    return jsonify([{
-        'id': i.id,
-        'title': i.title,
-        'company': i.company,
-        'company_type': i.company_type,
-        'location': i.location,
-        'duration': i.duration,
-        'stipend': i.stipend,
-        'start_date': i.start_date.isoformat(),
-        'end_date': i.end_date.isoformat(),
-        'application_deadline': i.application_deadline.isoformat(),
-        'category': i.category
-    } for i in internships])
+    response = jsonify([serialize_internship(i) for i in internships])
+    response.headers['X-Changes-Cursor'] = str(cursor)
+    return response
+
+@app.route('/api/internships/changes')
+def api_internship_changes():
+    """API endpoint for internships changed after a sync cursor"""
+    since = request.args.get('since', '0')
+    limit = request.args.get('limit', '500')
+    if not since.isdigit():
+        return jsonify({'error': 'since must be a non-negative cursor'}), 400
+    if not limit.isdigit():
+        return jsonify({'error': 'limit must be a non-negative integer'}), 400
+    since = int(since)
+    limit = min(max(int(limit), 1), 1000)
+    
+    changes = InternshipChange.query.filter(InternshipChange.id > since).order_by(
+        InternshipChange.id
+    ).limit(limit + 1).all()
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    
+    # Only the latest change per internship in this page matters
+    latest = {}
+    for change in changes:
+        latest[change.internship_id] = change.change_type
+    
+    upserted_ids = [internship_id for internship_id, change_type in latest.items() if change_type == 'upsert']
+    internships = Internship.query.filter(
+        Internship.id.in_(upserted_ids),
+        Internship.is_verified == True
+    ).all() if upserted_ids else []
+    
+    # Rows removed after this page was logged are reported as tombstones now
+    found_ids = {i.id for i in internships}
+    deleted = sorted(internship_id for internship_id, change_type in latest.items()
+                     if change_type == 'delete' or internship_id not in found_ids)
+    
+    return jsonify({
+        'cursor': changes[-1].id if changes else since,
+        'has_more': has_more,
+        'upserted': [serialize_internship(i) for i in internships],
+        'deleted': deleted
+    })
 
 @app.route('/api/stats')
 def api_stats():
@@ -358,9 +645,46 @@ def api_stats():
         'private_internships': private_internships
     })
 
+# CLI Commands
+@app.cli.command('precompute-recommendations')
+@click.option('--top-n', default=RECOMMENDATION_COUNT, show_default=True, help='Internships stored per user.')
+@click.option('--workers', default=os.cpu_count() or 1, show_default=True, help='Scoring processes.')
+@click.option('--batch-size', default=10000, show_default=True, help='Users loaded and written per transaction.')
+@click.option('--chunk-size', default=1000, show_default=True, help='Users scored per worker task.')
+def precompute_recommendations(top_n, workers, batch_size, chunk_size):
+    """Score every user against open internships and store each user's top N"""
+    internships = Internship.query.filter(open_internships_filter()).order_by(Internship.id).all()
+    ids, vocabulary, matrix = recommendations.build_internship_matrix(internships)
+    click.echo(f'Scoring users against {len(internships)} open internships ({len(vocabulary)} features)')
+    
+    pool = recommendations.create_pool(matrix, workers) if workers > 1 else None
+    computed_at = datetime.utcnow()
+    last_id = 0
+    total = 0
+    try:
+        while True:
+            # Keyset pagination keeps each batch an index range scan
+            users = User.query.filter(User.id > last_id).order_by(User.id).limit(batch_size).all()
+            if not users:
+                break
+            last_id = users[-1].id
+            
+            ranked = recommendations.score_users(users, ids, vocabulary, matrix, top_n,
+                                                 pool=pool, chunk_size=chunk_size)
+            store_recommendations(users, ranked, computed_at)
+            db.session.commit()
+            db.session.expunge_all()
+            
+            total += len(users)
+            click.echo(f'Stored recommendations for {total} users')
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
 if __name__ == '__main__':
     with app.app_context():
         db.create_all()
+        upgrade_schema()
         populate_database()
     
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,48 @@
+"""
+Shared pytest fixtures for InternshipHub's database tests
+Tests never use the app's own DATABASE_URL: they run against TEST_DATABASE_URL
+when it is set (e.g. a local PostgreSQL instance), otherwise a throwaway SQLite file
+"""
+
+import pytest
+from flask import Flask
+
+from app import app, db, database_url, REPLICA_BIND
+
+TEST_DATABASE_URL = database_url('TEST_DATABASE_URL')
+
+@pytest.fixture
+def make_app(tmp_path):
+    """Factory for apps serving InternshipHub's routes on a fresh test schema"""
+    created = []
+
+    def factory(replica_url=None):
+        test_app = Flask(app.import_name, root_path=app.root_path)
+        test_app.config.update(
+            TESTING=True,
+            SECRET_KEY='test',
+            SQLALCHEMY_DATABASE_URI=TEST_DATABASE_URL or f"sqlite:///{tmp_path / 'primary.db'}",
+            SQLALCHEMY_TRACK_MODIFICATIONS=False
+        )
+        if replica_url:
+            test_app.config['SQLALCHEMY_BINDS'] = {REPLICA_BIND: replica_url}
+
+        # Share the real routes; only the database configuration differs
+        test_app.url_map = app.url_map
+        test_app.view_functions = app.view_functions
+        db.init_app(test_app)
+
+        with test_app.app_context():
+            # Models all live on the primary; a replica bind only mirrors it
+            db.create_all(bind_key=None)
+        created.append(test_app)
+        return test_app
+
+    yield factory
+
+    for test_app in created:
+        with test_app.app_context():
+            db.session.remove()
+            db.drop_all(bind_key=None)
+            for engine in db.engines.values():
+                engine.dispose()
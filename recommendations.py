@@ -0,0 +1,149 @@
+"""
+Vectorized internship recommendation scoring for InternshipHub
+Users and internships are encoded as sparse feature matrices so a whole
+batch of users is scored against every open internship with one product
+"""
+
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy import sparse
+
+# Feature weights
+SKILL_WEIGHT = 1.0
+FIELD_WEIGHT = 2.0
+EDUCATION_WEIGHT = 1.0
+
+EDUCATION_LEVELS = {
+    'high school': ['high school', '12th'],
+    'diploma': ['diploma'],
+    "bachelor's": ["bachelor's", 'bachelor', 'undergraduate', 'b.tech', 'b.e.'],
+    "master's": ["master's", 'master', 'postgraduate', 'm.tech', 'mba'],
+    'phd': ['phd', 'ph.d', 'doctoral'],
+}
+
+# Aliases must match whole words: 'master' not in 'mastery', 'mba' not in 'Mumbai'
+EDUCATION_PATTERNS = {
+    level: re.compile(r'(?<!\w)(?:' + '|'.join(re.escape(alias) for alias in aliases) + r')(?!\w)')
+    for level, aliases in EDUCATION_LEVELS.items()
+}
+
+STOPWORDS = {'and', 'the', 'for', 'with', 'related', 'field', 'studies'}
+
+def split_skills(text):
+    """Split a comma-separated skills string into normalised skill names"""
+    return {skill.strip().lower() for skill in (text or '').split(',') if skill.strip()}
+
+def field_words(text):
+    """Significant words of a field of study or category"""
+    return {word for word in re.findall(r'[a-z]+', (text or '').lower())
+            if len(word) > 2 and word not in STOPWORDS}
+
+def user_features(user):
+    """Weighted features describing what a user is looking for"""
+    features = {f'skill:{skill}': SKILL_WEIGHT for skill in split_skills(user.skills)}
+
+    # Spread the field weight so multi-word fields are not favoured
+    words = field_words(user.field_of_study)
+    for word in words:
+        features[f'field:{word}'] = FIELD_WEIGHT / len(words)
+
+    if user.education_level:
+        features[f'edu:{user.education_level.lower()}'] = EDUCATION_WEIGHT
+    return features
+
+def internship_features(internship):
+    """Features an internship offers; each matching user feature adds its weight"""
+    features = {f'skill:{skill}' for skill in split_skills(internship.skills_required)}
+    features |= {f'field:{word}' for word in field_words(internship.category) | field_words(internship.requirements)}
+
+    # Postings that name no education level are open to every level
+    requirements = (internship.requirements or '').lower()
+    levels = [level for level, pattern in EDUCATION_PATTERNS.items() if pattern.search(requirements)]
+    features |= {f'edu:{level}' for level in (levels or EDUCATION_LEVELS)}
+    return features
+
+def build_internship_matrix(internships):
+    """Encode internships as a (features x internships) binary matrix
+
+    Returns the internship ids, the feature vocabulary and the CSR matrix.
+    """
+    vocabulary = {}
+    rows, cols = [], []
+    for col, internship in enumerate(internships):
+        for feature in internship_features(internship):
+            rows.append(vocabulary.setdefault(feature, len(vocabulary)))
+            cols.append(col)
+
+    ids = np.array([internship.id for internship in internships], dtype=np.int64)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+        shape=(len(vocabulary), len(internships))
+    )
+    return ids, vocabulary, matrix
+
+def build_user_matrix(users, vocabulary):
+    """Encode users as a (users x features) weight matrix over the internship vocabulary"""
+    rows, cols, weights = [], [], []
+    for row, user in enumerate(users):
+        for feature, weight in user_features(user).items():
+            col = vocabulary.get(feature)
+            if col is not None:
+                rows.append(row)
+                cols.append(col)
+                weights.append(weight)
+
+    return sparse.csr_matrix(
+        (np.array(weights, dtype=np.float32), (rows, cols)),
+        shape=(len(users), len(vocabulary))
+    )
+
+def top_n_scores(user_matrix, internship_matrix, top_n):
+    """Score a block of users and keep each user's best internships
+
+    Returns one list of (column, score) pairs per user, best first; internships
+    with no overlap at all are never recommended.
+    """
+    scores = (user_matrix @ internship_matrix).toarray()
+    n = min(top_n, scores.shape[1])
+    if n == 0:
+        return [[] for _ in range(scores.shape[0])]
+
+    best = np.argpartition(-scores, n - 1, axis=1)[:, :n]
+    best_scores = np.take_along_axis(scores, best, axis=1)
+    order = np.argsort(-best_scores, axis=1, kind='stable')
+    best = np.take_along_axis(best, order, axis=1)
+    best_scores = np.take_along_axis(best_scores, order, axis=1)
+
+    return [[(int(col), float(score)) for col, score in zip(cols, row_scores) if score > 0]
+            for cols, row_scores in zip(best, best_scores)]
+
+# Worker processes receive the internship matrix once, at start-up
+_worker_matrix = None
+
+def _init_worker(internship_matrix):
+    global _worker_matrix
+    _worker_matrix = internship_matrix
+
+def _score_chunk(args):
+    user_matrix, top_n = args
+    return top_n_scores(user_matrix, _worker_matrix, top_n)
+
+def create_pool(internship_matrix, workers):
+    """Process pool whose workers score user chunks against internship_matrix"""
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                               initargs=(internship_matrix,))
+
+def score_users(users, ids, vocabulary, internship_matrix, top_n, pool=None, chunk_size=1000):
+    """Top-N (internship_id, score) pairs for each user, in input order"""
+    user_matrix = build_user_matrix(users, vocabulary)
+    chunks = [user_matrix[start:start + chunk_size] for start in range(0, len(users), chunk_size)]
+
+    if pool is None:
+        results = [top_n_scores(chunk, internship_matrix, top_n) for chunk in chunks]
+    else:
+        results = pool.map(_score_chunk, [(chunk, top_n) for chunk in chunks])
+
+    return [[(int(ids[col]), score) for col, score in ranked]
+            for chunk_result in results for ranked in chunk_result]
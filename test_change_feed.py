@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Change feed tests for InternshipHub
+Run with pytest; see conftest.py for the database each test gets
+"""
+
+import threading
+
+from sqlalchemy import func
+
+from app import db, InternshipChange, log_internship_change
+
+def latest_committed_id(engine):
+    with engine.connect() as connection:
+        return connection.execute(db.select(func.max(InternshipChange.id))).scalar() or 0
+
+def test_change_log_commits_in_cursor_order(make_app):
+    """A change logged after an in-flight one must not become visible first"""
+    test_app = make_app()
+    client = test_app.test_client()
+    with test_app.app_context():
+        engine = db.engine
+
+        first = engine.connect()
+        transaction = first.begin()
+        log_internship_change(first, 1, 'upsert')
+        first_id = first.execute(db.select(func.max(InternshipChange.id))).scalar()
+
+        second = {}
+        def second_writer():
+            with engine.begin() as connection:
+                log_internship_change(connection, 2, 'upsert')
+                second['id'] = connection.execute(db.select(func.max(InternshipChange.id))).scalar()
+
+        writer = threading.Thread(target=second_writer)
+        writer.start()
+        writer.join(0.5)
+
+        try:
+            # While the first change is uncommitted, no cursor may move past it
+            assert latest_committed_id(engine) < first_id
+            cursor = client.get('/api/internships/changes?since=0').get_json()['cursor']
+            assert cursor < first_id
+        finally:
+            transaction.commit()
+            first.close()
+            writer.join()
+
+        assert second['id'] > first_id
+        data = client.get(f'/api/internships/changes?since={first_id - 1}').get_json()
+        assert data['cursor'] == second['id']
+
+def test_malformed_parameters_are_rejected(make_app):
+    """Bad cursors must not silently replay the whole catalogue"""
+    client = make_app().test_client()
+    for query in ['since=abc', 'since=-1', 'since=1.5', 'since=', 'limit=x', 'limit=-5']:
+        response = client.get(f'/api/internships/changes?{query}')
+        assert response.status_code == 400, query
+        assert 'error' in response.get_json()
+
+    assert client.get('/api/internships/changes?since=0&limit=10').status_code == 200
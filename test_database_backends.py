@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Database backend tests for InternshipHub
+Covers read/write routing and the PostgreSQL-specific upsert and search paths;
+run with pytest, PostgreSQL tests need TEST_DATABASE_URL to point at PostgreSQL
+"""
+
+import json
+import os
+from datetime import date
+
+import pytest
+from flask import request
+
+from app import (app, db, Application, Internship, InternshipChange, User, REPLICA_BIND,
+                 populate_database, search_filter, upgrade_schema)
+from conftest import TEST_DATABASE_URL
+
+requires_postgresql = pytest.mark.skipif(
+    not (TEST_DATABASE_URL or '').startswith('postgresql'),
+    reason='TEST_DATABASE_URL is not a PostgreSQL database'
+)
+
+def internship_values(title, description='Hands-on work with the team'):
+    return {
+        'title': title,
+        'company': 'Test Company',
+        'company_type': 'private',
+        'description': description,
+        'requirements': "Bachelor's in any field",
+        'duration': '3 months',
+        'location': 'Remote',
+        'start_date': date(2030, 1, 1),
+        'end_date': date(2030, 3, 31),
+        'application_deadline': date(2029, 12, 1),
+        'category': 'Technology',
+        'is_verified': True
+    }
+
+def load_sample_internships():
+    with open(os.path.join(app.root_path, 'internships.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+def test_read_only_routes_use_replica(make_app, tmp_path):
+    """Catalogue reads on read-only routes come from the replica, writes and user data from the primary"""
+    test_app = make_app(replica_url=f"sqlite:///{tmp_path / 'replica.db'}")
+    with test_app.app_context():
+        replica = db.engines[REPLICA_BIND]
+        primary = db.engines[None]
+        db.metadata.create_all(replica)
+        with replica.begin() as connection:
+            connection.execute(Internship.__table__.insert().values(internship_values('Replica posting')))
+        db.session.add(Internship(**internship_values('Primary posting')))
+        db.session.commit()
+
+    response = test_app.test_client().get('/api/internships')
+    assert [i['title'] for i in response.get_json()] == ['Replica posting']
+
+    for path in ['/', '/internships', '/internship/1', '/api/stats']:
+        with test_app.test_request_context(path):
+            session = db.session()
+            assert session.get_bind(Internship) is replica, request.endpoint
+            # Users must see their own writes straight after a redirect
+            assert session.get_bind(User) is primary, request.endpoint
+            assert session.get_bind(Application) is primary, request.endpoint
+
+    for path, method in [('/dashboard', 'GET'), ('/apply/1', 'POST'), ('/update_profile', 'POST')]:
+        with test_app.test_request_context(path, method=method):
+            assert db.session().get_bind(Internship) is primary, request.endpoint
+
+def test_search_filter_matches_title(make_app):
+    """Search works on whichever backend the tests run against"""
+    test_app = make_app()
+    with test_app.app_context():
+        db.session.add(Internship(**internship_values('Machine Learning Intern')))
+        db.session.add(Internship(**internship_values('Marketing Intern')))
+        db.session.commit()
+        results = Internship.query.filter(search_filter('Machine')).all()
+        assert [i.title for i in results] == ['Machine Learning Intern']
+
+@requires_postgresql
+def test_search_filter_uses_full_text(make_app):
+    """PostgreSQL search matches words in any order and has its GIN index"""
+    test_app = make_app()
+    with test_app.app_context():
+        db.session.add(Internship(**internship_values('Machine Learning Intern')))
+        db.session.add(Internship(**internship_values('Marketing Intern', 'Learning by doing')))
+        db.session.commit()
+
+        results = Internship.query.filter(search_filter('learning machine')).all()
+        assert [i.title for i in results] == ['Machine Learning Intern']
+
+        indexes = db.session.execute(db.text(
+            "SELECT indexname FROM pg_indexes WHERE tablename = 'internship'"
+        )).scalars().all()
+        assert 'ix_internship_search' in indexes
+
+@requires_postgresql
+def test_populate_database_is_idempotent(make_app, monkeypatch):
+    """ON CONFLICT DO NOTHING skips existing rows and only logs the new ones"""
+    sample = load_sample_internships()
+    monkeypatch.setattr('app.load_sample_data', lambda: sample)
+    test_app = make_app()
+    with test_app.app_context():
+        populate_database()
+        populate_database()
+        assert Internship.query.count() == len(sample)
+        assert InternshipChange.query.filter_by(change_type='upsert').count() == len(sample)
+
+@requires_postgresql
+def test_upgrade_schema_adds_missing_constraint(make_app, monkeypatch):
+    """Tables created before the unique constraint can still load sample data"""
+    sample = load_sample_internships()
+    monkeypatch.setattr('app.load_sample_data', lambda: sample)
+    test_app = make_app()
+    with test_app.app_context():
+        db.session.execute(db.text('ALTER TABLE internship DROP CONSTRAINT uq_internship_title_company'))
+        db.session.commit()
+
+        upgrade_schema()
+        populate_database()
+        populate_database()
+        assert Internship.query.count() == len(sample)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Stored recommendation tests for InternshipHub
+Covers how dashboard visits and the batch job write UserRecommendation rows;
+run with pytest, the concurrency test needs TEST_DATABASE_URL to point at PostgreSQL
+"""
+
+import threading
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app import (db, Internship, User, UserRecommendation, RECOMMENDATION_COUNT,
+                 lock_users, recommend_for_user, store_recommendations)
+from conftest import TEST_DATABASE_URL
+
+requires_postgresql = pytest.mark.skipif(
+    not (TEST_DATABASE_URL or '').startswith('postgresql'),
+    reason='TEST_DATABASE_URL is not a PostgreSQL database'
+)
+
+@pytest.fixture
+def test_app(make_app, monkeypatch):
+    """App with one user and more matching open internships than fit on the dashboard"""
+    # The matrix cache is per process; never reuse one built for another test database
+    monkeypatch.setattr('app._open_internship_matrix', {})
+    test_app = make_app()
+    with test_app.app_context():
+        for n in range(RECOMMENDATION_COUNT + 2):
+            db.session.add(Internship(
+                title=f'Python Intern {n}', company='Test Company', company_type='private',
+                description='Backend work', requirements="Bachelor's in Computer Science",
+                duration='3 months', location='Remote', start_date=date(2030, 1, 1),
+                end_date=date(2030, 3, 31), application_deadline=date(2029, 12, 1),
+                category='Technology', skills_required='Python', is_verified=True
+            ))
+        db.session.add(User(
+            name='Test User', email='test@example.com', mobile='9876543210',
+            education_level="Bachelor's", field_of_study='Computer Science',
+            university='Test University', graduation_year=2026, skills='Python'
+        ))
+        db.session.commit()
+    return test_app
+
+def stored_ranks(user_id):
+    return [r.rank for r in UserRecommendation.query.filter_by(user_id=user_id).order_by(UserRecommendation.rank)]
+
+def test_first_visit_is_scored_once(test_app):
+    """The first dashboard visit stores picks and marks the user; later visits reuse them"""
+    with test_app.app_context():
+        user = User.query.one()
+        recommended = recommend_for_user(user)
+        computed_at = user.recommendations_computed_at
+
+        assert len(recommended) == RECOMMENDATION_COUNT
+        assert len({i.id for i in recommended}) == RECOMMENDATION_COUNT
+        assert computed_at is not None
+
+        assert recommend_for_user(user) == recommended
+        assert user.recommendations_computed_at == computed_at
+        assert stored_ranks(user.id) == list(range(RECOMMENDATION_COUNT))
+
+def test_duplicate_ranks_are_rejected(test_app):
+    """A second writer can never store the same rank twice for one user"""
+    with test_app.app_context():
+        user = User.query.one()
+        internship = Internship.query.first()
+        for _ in range(2):
+            db.session.add(UserRecommendation(user_id=user.id, internship_id=internship.id, rank=0, score=1.0))
+        with pytest.raises(IntegrityError):
+            db.session.commit()
+        db.session.rollback()
+
+@requires_postgresql
+def test_concurrent_first_visits_store_one_set(test_app):
+    """A visit arriving while another is storing waits for it instead of writing again"""
+    with test_app.app_context():
+        user = User.query.one()
+        user_id = user.id
+
+        # An in-flight first visit (or batch job) holding the user's lock
+        lock_users([user_id])
+
+        second = {}
+        def second_visit():
+            with test_app.app_context():
+                second['recommended'] = recommend_for_user(db.session.get(User, user_id))
+
+        visitor = threading.Thread(target=second_visit)
+        visitor.start()
+        visitor.join(0.5)
+        try:
+            assert visitor.is_alive()
+            internships = Internship.query.order_by(Internship.id).limit(RECOMMENDATION_COUNT).all()
+            store_recommendations([user], [[(i.id, 1.0) for i in internships]], datetime.utcnow())
+            db.session.commit()
+        finally:
+            visitor.join()
+
+        assert stored_ranks(user_id) == list(range(RECOMMENDATION_COUNT))
+        assert [i.id for i in second['recommended']] == [i.id for i in internships]
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Recommendation scoring tests for InternshipHub
+Exercises the pure NumPy/SciPy functions in recommendations.py; no server or database needed
+"""
+
+from types import SimpleNamespace
+
+import recommendations
+
+def make_internship(id, skills, category='Technology', requirements=''):
+    return SimpleNamespace(id=id, skills_required=skills, category=category, requirements=requirements)
+
+def make_user(skills, field_of_study='Computer Science', education_level="Bachelor's"):
+    return SimpleNamespace(skills=skills, field_of_study=field_of_study, education_level=education_level)
+
+INTERNSHIPS = [
+    make_internship(10, 'Python, Machine Learning', 'Research', "Bachelor's in Computer Science"),
+    make_internship(20, 'Python', 'Technology', "Master's in Computer Science"),
+    make_internship(30, 'Social Media, Communication', 'Business', "Master's in Marketing"),
+    make_internship(40, 'Python, Machine Learning, Statistics', 'Research', "Bachelor's in Computer Science"),
+]
+
+def score(users, internships=INTERNSHIPS, top_n=3, **kwargs):
+    ids, vocabulary, matrix = recommendations.build_internship_matrix(internships)
+    return recommendations.score_users(users, ids, vocabulary, matrix, top_n, **kwargs)
+
+def test_build_internship_matrix():
+    """Internships become columns of a features x internships matrix"""
+    ids, vocabulary, matrix = recommendations.build_internship_matrix(INTERNSHIPS)
+    assert list(ids) == [10, 20, 30, 40]
+    assert matrix.shape == (len(vocabulary), len(INTERNSHIPS))
+    assert matrix[vocabulary['skill:python'], 0] == 1
+    assert matrix[vocabulary['skill:python'], 2] == 0
+
+def test_ranks_are_ordered_by_score():
+    """Best matches come first and scores never increase down the list"""
+    ranked = score([make_user('Python, Machine Learning, Statistics')])[0]
+    assert [internship_id for internship_id, _ in ranked] == [40, 10, 20]
+    scores = [s for _, s in ranked]
+    assert scores == sorted(scores, reverse=True)
+
+def test_zero_scores_are_dropped():
+    """Internships sharing no feature with the user are never recommended"""
+    user = make_user('Knitting', field_of_study='Zoology', education_level='Diploma')
+    assert score([user]) == [[]]
+
+def test_top_n_larger_than_catalogue():
+    """Asking for more picks than internships returns every positive match"""
+    ranked = score([make_user('Python, Social Media')], top_n=50)[0]
+    assert sorted(internship_id for internship_id, _ in ranked) == [10, 20, 30, 40]
+
+def test_empty_catalogue():
+    """No open internships means no recommendations, not an error"""
+    assert score([make_user('Python'), make_user('Communication')], internships=[]) == [[], []]
+
+def test_education_levels_match_whole_words():
+    """Words that merely contain a level alias do not restrict a posting"""
+    def levels(requirements):
+        features = recommendations.internship_features(make_internship(1, '', requirements=requirements))
+        return sorted(feature for feature in features if feature.startswith('edu:'))
+
+    every_level = sorted(f'edu:{level}' for level in recommendations.EDUCATION_LEVELS)
+    assert levels('Mastery of Excel, based in Mumbai, some web.e.g. Django work') == every_level
+    assert levels("Pursuing a Master's or MBA") == ["edu:master's"]
+    assert levels('B.E. or B.Tech in Mechanical') == ["edu:bachelor's"]
+
+def test_pool_matches_serial():
+    """Scoring across worker processes gives the same result as scoring inline"""
+    users = [make_user(skills, field, level)
+             for skills in ['Python', 'Python, Statistics', 'Communication', '']
+             for field in ['Computer Science', 'Marketing']
+             for level in ["Bachelor's", "Master's"]]
+    ids, vocabulary, matrix = recommendations.build_internship_matrix(INTERNSHIPS)
+
+    serial = recommendations.score_users(users, ids, vocabulary, matrix, 3, chunk_size=5)
+    pool = recommendations.create_pool(matrix, 2)
+    try:
+        parallel = recommendations.score_users(users, ids, vocabulary, matrix, 3, pool=pool, chunk_size=5)
+    finally:
+        pool.shutdown()
+    assert parallel == serial
+
+if __name__ == "__main__":
+    test_build_internship_matrix()
+    test_ranks_are_ordered_by_score()
+    test_zero_scores_are_dropped()
+    test_top_n_larger_than_catalogue()
+    test_empty_catalogue()
+    test_education_levels_match_whole_words()
+    test_pool_matches_serial()
+    print("Recommendation tests passed")
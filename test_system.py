@@ -97,6 +97,32 @@ class InternshipHubTester:
             self.log_test("Stats API", False, f"Error: {str(e)}")
             return False
             
+    def test_internship_changes_api(self):
+        """Test incremental internships change feed"""
+        try:
+            response = self.session.get(f"{BASE_URL}/api/internships")
+            cursor = response.headers.get("X-Changes-Cursor")
+            if response.status_code != 200 or cursor is None:
+                self.log_test("Changes API", False, "Internships API did not return a change cursor")
+                return False
+                
+            response = self.session.get(f"{BASE_URL}/api/internships/changes", params={"since": cursor})
+            if response.status_code == 200:
+                data = response.json()
+                required_keys = ['cursor', 'has_more', 'upserted', 'deleted']
+                if all(key in data for key in required_keys) and data['cursor'] >= int(cursor):
+                    self.log_test("Changes API", True, f"{len(data['upserted'])} upserted, {len(data['deleted'])} deleted since cursor {cursor}")
+                    return True
+                else:
+                    self.log_test("Changes API", False, "Missing required change feed fields")
+                    return False
+            else:
+                self.log_test("Changes API", False, f"API returned status {response.status_code}")
+                return False
+        except Exception as e:
+            self.log_test("Changes API", False, f"Error: {str(e)}")
+            return False
+            
     def test_internships_page(self):
         """Test internships browsing page"""
         try:
@@ -224,6 +250,7 @@ class InternshipHubTester:
         self.test_homepage_loads()
         self.test_internships_api()
         self.test_stats_api()
+        self.test_internship_changes_api()
         self.test_internships_page()
         
         # User interface tests